@@ -0,0 +1,92 @@
+import os
+import re
+import textwrap
+import json
+
+# JSON whitespace, and whitespace plus the commas between array items
+_WHITESPACE_RE = re.compile(r'[ \t\r\n]*')
+_SEPARATORS_RE = re.compile(r'[ \t\r\n,]*')
+
+
+def iter_json_array(f, chunk_size=1 << 16):
+    """Yield the objects of a top-level JSON array one at a time from a text file"""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+    started = False
+    
+    while True:
+        # Skip whitespace and the separators between items
+        pos = (_SEPARATORS_RE if started else _WHITESPACE_RE).match(buffer, pos).end()
+        if pos == len(buffer):
+            if eof:
+                raise ValueError("Unexpected end of JSON array")
+            buffer = f.read(chunk_size)
+            pos = 0
+            eof = not buffer
+            continue
+        
+        if not started:
+            if buffer[pos] != '[':
+                raise ValueError("Expected a JSON array")
+            pos += 1
+            started = True
+            continue
+        
+        if buffer[pos] == ']':
+            return
+        
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+            after = _WHITESPACE_RE.match(buffer, end).end()
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            after = None
+        
+        # An item is complete only once the ',' or ']' after it is buffered; until
+        # then it may span the chunk boundary (a number can be cut short anywhere),
+        # so keep only its start, read more and retry
+        if after is None or after == len(buffer) or buffer[after] not in ',]':
+            if eof:
+                raise ValueError("Expected ',' or ']' after JSON array item")
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+        
+        yield item
+        pos = after
+
+
+def append_to_json_array(path, items):
+    """Append items to a JSON array file in place, without rewriting existing entries"""
+    if not path.exists() or path.stat().st_size == 0:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(items, f, indent=2, ensure_ascii=False)
+        return
+    
+    def previous_non_space(f, pos):
+        # Step backwards from pos to the nearest non-whitespace byte
+        while pos > 0:
+            pos -= 1
+            f.seek(pos)
+            char = f.read(1)
+            if not char.isspace():
+                return pos, char
+        return -1, b''
+    
+    with open(path, 'rb+') as f:
+        end = f.seek(0, os.SEEK_END)
+        close_pos, close_char = previous_non_space(f, end)
+        if close_char != b']':
+            raise ValueError(f"{path} does not end with a JSON array")
+        last_pos, last_char = previous_non_space(f, close_pos)
+        
+        separator = '\n' if last_char == b'[' else ',\n'
+        body = ',\n'.join(textwrap.indent(json.dumps(item, indent=2, ensure_ascii=False), '  ') for item in items)
+        f.seek(last_pos + 1)
+        f.truncate()
+        f.write(f"{separator}{body}\n]".encode('utf-8'))
@@ -1,9 +1,19 @@
 import os
 import re
 import json
+import mmap
 import time
+import sqlite3
 import hashlib
 import threading
+import queue
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import html
+import http.cookiejar
+import urllib.error
+import urllib.parse
+import urllib.request
 from pathlib import Path
 from datetime import datetime
 from selenium import webdriver
@@ -12,31 +22,173 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import (
+    TimeoutException,
+    NoSuchElementException,
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+)
 import shutil
+import signal
+import socket
+import subprocess
+import sys
+import logging
 from watchdog.observers import Observer
+from watchdog.observers.polling import PollingObserver
 from watchdog.events import FileSystemEventHandler
+from json_array import iter_json_array, append_to_json_array
+
+# Set up logging; per-poll download progress is logged at DEBUG
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Google Drive and WeTransfer links, matched in a single pass per message
+_LINK_RE = re.compile(
+    r'https://drive\.google\.com/file/d/[^/\s]+[^\s]*'
+    r'|https://drive\.google\.com/open\?id=[^\s]+'
+    r'|https://we\.tl/t-[^\s]+'
+    r'|https://wetransfer\.com/downloads/[^\s]+'
+)
+
+# Google Drive virus-warning confirm token, and the hidden download form that
+# newer warning pages submit instead of a confirm= link
+_CONFIRM_RE = re.compile(r'confirm=([a-zA-Z0-9_-]+)')
+_DRIVE_FORM_ACTION_RE = re.compile(r'<form[^>]+id="download-form"[^>]+action="([^"]+)"')
+_HIDDEN_INPUT_RE = re.compile(r'<input[^>]+type="hidden"[^>]+name="([^"]+)"[^>]+value="([^"]*)"')
+
+# Checks the open page for the virus-scan warning and pulls its confirm token
+# (pattern in arguments[0]) in the browser, so only [is_warning, token] comes
+# back over the driver connection instead of the whole page source
+_DRIVE_WARNING_JS = """
+const html = document.documentElement.outerHTML;
+const lower = html.toLowerCase();
+const isWarning = lower.includes('virus scan warning') || lower.includes("can't scan this file for viruses");
+const match = isWarning ? html.match(new RegExp(arguments[0])) : null;
+return [isWarning, match ? match[1] : null];
+"""
+
+# WeTransfer share URLs: /downloads/<transfer_id>[/<recipient_id>]/<security_hash>
+_WETRANSFER_PATH_RE = re.compile(r'/downloads/([0-9a-f]+)/(?:([0-9a-f]+)/)?([0-9a-f]+)')
+_WETRANSFER_API_URL = "https://wetransfer.com/api/v4/transfers/{transfer_id}/download"
+
+# WeTransfer flow locators, each compiled once at import time into a single
+# CSS selector list so every step is one driver call. Button captions are
+# matched on lower-cased text in the page script rather than with XPath
+# translate(), which is re-evaluated for every node
+_COOKIE_SELECTOR = ", ".join([
+    "button[data-testid*='accept']",
+    "button[data-testid*='cookie']",
+    "[data-qa*='cookie'] button",
+    ".cookie-consent button",
+    "button[aria-label*='Accept']",
+])
+_AGREE_SELECTOR = ", ".join([
+    "button[data-testid*='agree']",
+    "button[aria-label^='agree' i]",
+])
+_DOWNLOAD_SELECTOR = ", ".join([
+    "button[data-testid='download-button']",
+    "a[data-testid='download-button']",
+])
+
+# First visible, enabled element that matches the CSS selector in arguments[0],
+# or whose caption contains (or with arguments[3], equals) the lower-case text
+# in arguments[2] among arguments[1] candidates; null if none. One round trip
+_FIRST_VISIBLE_JS = """
+const [selector, textSelector, text, exactText] = arguments;
+const elements = Array.from(document.querySelectorAll(selector));
+if (textSelector) {
+    for (const el of document.querySelectorAll(textSelector)) {
+        const caption = el.textContent.replace(/\\s+/g, ' ').trim().toLowerCase();
+        if (exactText ? caption === text : caption.includes(text)) {
+            elements.push(el);
+        }
+    }
+}
+return elements.find(el => {
+    const rect = el.getBoundingClientRect();
+    return rect.width && rect.height && !el.disabled && getComputedStyle(el).visibility !== 'hidden';
+}) || null;
+"""
+
+# Supported hosts mapped to the SeleniumVideoDownloader method that downloads
+# from them; subdomains such as www. fall back to their parent domain
+_HANDLERS = {
+    "drive.google.com": "download_google_drive",
+    "wetransfer.com": "download_wetransfer",
+    "we.tl": "download_wetransfer",
+}
+
+_VIDEO_EXTENSIONS = frozenset({'.mp4', '.avi', '.mov', '.mkv', '.wmv', '.flv', '.webm', '.m4v', '.3gp'})
+_IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'})
+_EXTENSION_TO_MEDIA_TYPE = {
+    **{ext: "video" for ext in _VIDEO_EXTENSIONS},
+    **{ext: "image" for ext in _IMAGE_EXTENSIONS},
+}
+_HTTP_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+def _drive_file_id(url):
+    """File ID from a /file/d/<id>/ or ?id=<id> Google Drive URL, or None"""
+    parts = urllib.parse.urlsplit(url)
+    if '/file/d/' in parts.path:
+        return parts.path.split('/file/d/')[1].split('/')[0]
+    return urllib.parse.parse_qs(parts.query).get('id', [None])[0]
+
+
+def _drive_confirm_url(page, file_id):
+    """URL that confirms a Google Drive virus-scan warning page, or None"""
+    form_action = _DRIVE_FORM_ACTION_RE.search(page)
+    if form_action:
+        fields = {name: html.unescape(value) for name, value in _HIDDEN_INPUT_RE.findall(page)}
+        return f"{html.unescape(form_action.group(1))}?{urllib.parse.urlencode(fields)}"
+    
+    confirm_match = _CONFIRM_RE.search(page)
+    if confirm_match:
+        return f"https://drive.google.com/uc?export=download&confirm={confirm_match.group(1)}&id={file_id}"
+    return None
+
+
+def _free_path(directory, filename):
+    """Path for filename in directory, numbered like "name (1).ext" if it is taken"""
+    target = directory / filename
+    counter = 1
+    while target.exists():
+        target = directory / f"{Path(filename).stem} ({counter}){Path(filename).suffix}"
+        counter += 1
+    return target
+
 
 class LinkDownloadManager:
-    def __init__(self, messages_file="rss/messages.json", media_file="media/links.json", download_dir="media"):
+    def __init__(self, messages_file="rss/messages.json", media_file="media/links.json", download_dir="media", max_workers=2, debug_port=None):
         self.messages_file = Path(messages_file).resolve()
         self.media_file = Path(media_file).resolve()
         self.download_dir = Path(download_dir)
         self.download_dir.mkdir(exist_ok=True)
         
-        # Track processed links to avoid duplicates
+        # Processed-link index, so startup doesn't re-parse links.json. It lives in a
+        # hidden subdirectory so its journal is never mistaken for a download
+        self.db_file = self.download_dir / ".index" / "processed_links.db"
+        self.db_file.parent.mkdir(exist_ok=True)
+        self.db = sqlite3.connect(self.db_file, check_same_thread=False)
+        self.db_lock = threading.Lock()
+        
+        # Track processed links (by URL) to avoid duplicates
         self.processed_links = set()
-        self.link_to_media_map = {}
-        self.last_messages_content = ""
+        self.last_content_hash = None
         self.last_file_size = 0
         self.last_modification_time = 0
         
-        # Thread safety
+        # Thread safety: _inflight is held for a whole processing run, so the
+        # watcher and the backup poller never process the same batch twice
         self.processing_lock = threading.Lock()
-        self.is_processing = False
+        self._inflight = threading.Lock()
         
-        # Initialize downloader (will be created per download to avoid conflicts)
-        self.downloader = None
+        # Downloads run in parallel; each worker borrows a browser from the pool.
+        # A long-running Chrome on debug_port is one browser, so it serves one worker
+        if debug_port:
+            max_workers = 1
+        self.browser_pool = BrowserPool(download_dir=str(self.download_dir), max_size=max_workers, debug_port=debug_port)
         
         # Load existing processed links
         self.load_processed_links()
@@ -54,14 +206,25 @@ class LinkDownloadManager:
                 stat = self.messages_file.stat()
                 self.last_modification_time = stat.st_mtime
                 self.last_file_size = stat.st_size
+                self.last_content_hash = self.hash_messages_file()
                 
-                with open(self.messages_file, 'r', encoding='utf-8') as f:
-                    self.last_messages_content = f.read()
-                    
-                print(f"📊 File state updated - Size: {self.last_file_size}, Modified: {datetime.fromtimestamp(self.last_modification_time)}")
+                # Formatting the timestamp is only worth it when it will be shown
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("File state updated - Size: %s, Modified: %s",
+                                 self.last_file_size, datetime.fromtimestamp(self.last_modification_time))
         except Exception as e:
             print(f"⚠️ Error updating file state: {e}")
     
+    def hash_messages_file(self):
+        """Digest of the messages file, hashed straight from a read-only memory map"""
+        digest = hashlib.blake2b(digest_size=8)
+        with open(self.messages_file, 'rb') as f:
+            # mmap rejects empty files; their digest is just the empty one
+            if os.fstat(f.fileno()).st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    digest.update(mm)
+        return digest.digest()
+    
     def has_file_changed(self):
         """Check if the messages file has actually changed"""
         try:
@@ -72,15 +235,17 @@ class LinkDownloadManager:
             current_mtime = stat.st_mtime
             current_size = stat.st_size
             
-            # Check modification time and size first (quick check)
-            if current_mtime <= self.last_modification_time and current_size == self.last_file_size:
-                return False
+            # A different size always means new content; no need to read the file
+            if current_size != self.last_file_size:
+                print(f"📄 File content changed - New size: {current_size}, Old size: {self.last_file_size}")
+                return True
             
-            # If time/size changed, check content
-            with open(self.messages_file, 'r', encoding='utf-8') as f:
-                current_content = f.read()
+            # Same size and not modified since the last check
+            if current_mtime <= self.last_modification_time:
+                return False
             
-            if current_content == self.last_messages_content:
+            # Modified but same size; only the content can tell a touch from an edit
+            if self.hash_messages_file() == self.last_content_hash:
                 # File was touched but content didn't change
                 self.last_modification_time = current_mtime
                 self.last_file_size = current_size
@@ -94,19 +259,29 @@ class LinkDownloadManager:
             return False
     
     def load_processed_links(self):
-        """Load already processed links from links.json to avoid re-downloading"""
+        """Load already processed links from the SQLite index to avoid re-downloading"""
         try:
-            if self.media_file.exists():
-                with open(self.media_file, 'r', encoding='utf-8') as f:
-                    media_data = json.load(f)
+            with self.db_lock, self.db:
+                self.db.execute("CREATE TABLE IF NOT EXISTS processed (url TEXT PRIMARY KEY, media_id TEXT, timestamp INTEGER)")
                 
-                for entry in media_data:
-                    if 'source_link' in entry:
-                        link_hash = hashlib.md5(entry['source_link'].encode()).hexdigest()
-                        self.processed_links.add(link_hash)
-                        self.link_to_media_map[link_hash] = entry
+                # The index only mirrors links.json; when that was deleted (e.g. by
+                # garbageCollector.py --mode clean) its links must be downloaded again
+                if not self.media_file.exists():
+                    self.db.execute("DELETE FROM processed")
                 
-                print(f"📚 Loaded {len(self.processed_links)} previously processed links")
+                # One-time import from links.json for archives created before the index existed
+                is_empty = self.db.execute("SELECT 1 FROM processed LIMIT 1").fetchone() is None
+                if is_empty and self.media_file.exists():
+                    with open(self.media_file, 'r', encoding='utf-8') as f:
+                        media_data = json.load(f)
+                    self.db.executemany(
+                        "INSERT OR IGNORE INTO processed (url, media_id, timestamp) VALUES (?, ?, ?)",
+                        [(entry['source_link'], entry.get('id'), entry.get('timestamp'))
+                         for entry in media_data if 'source_link' in entry])
+                
+                self.processed_links.update(url for (url,) in self.db.execute("SELECT url FROM processed"))
+            
+            print(f"📚 Loaded {len(self.processed_links)} previously processed links")
         except Exception as e:
             print(f"⚠️ Error loading processed links: {e}")
     
@@ -117,24 +292,19 @@ class LinkDownloadManager:
                 print(f"❌ Messages file not found: {self.messages_file}")
                 return []
             
-            with open(self.messages_file, 'r', encoding='utf-8') as f:
-                messages = json.load(f)
-            
             links = []
-            link_patterns = [
-                r'https://drive\.google\.com/file/d/[^/\s]+[^\s]*',
-                r'https://drive\.google\.com/open\?id=[^\s]+',
-                r'https://we\.tl/t-[^\s]+',
-                r'https://wetransfer\.com/downloads/[^\s]+'
-            ]
-            
-            for message in messages:
-                if message.get('type') == 'chat' and message.get('body'):
-                    body = message['body']
-                    
-                    for pattern in link_patterns:
-                        matches = re.findall(pattern, body)
-                        for match in matches:
+            
+            # Stream messages one at a time instead of loading the whole export
+            with open(self.messages_file, 'r', encoding='utf-8') as f:
+                for message in iter_json_array(f):
+                    if message.get('type') == 'chat' and message.get('body'):
+                        body = message['body']
+                        
+                        # Most chat messages carry no URL; skip the regex for them
+                        if 'https://' not in body:
+                            continue
+                        
+                        for match in _LINK_RE.findall(body):
                             # Clean up the URL (remove any trailing characters)
                             clean_url = match.rstrip('.,;!?)')
                             
@@ -156,46 +326,42 @@ class LinkDownloadManager:
     
     def is_link_processed(self, url):
         """Check if a link has already been processed"""
-        link_hash = hashlib.md5(url.encode()).hexdigest()
-        return link_hash in self.processed_links
+        return url in self.processed_links
     
     def mark_link_processed(self, url, media_info=None):
         """Mark a link as processed"""
-        link_hash = hashlib.md5(url.encode()).hexdigest()
-        self.processed_links.add(link_hash)
-        if media_info:
-            self.link_to_media_map[link_hash] = media_info
+        self.processed_links.add(url)
+        
+        # Without a media entry nothing was saved, so only skip it for this run
+        if not media_info:
+            return
+        
+        try:
+            with self.db_lock, self.db:
+                self.db.execute(
+                    "INSERT OR IGNORE INTO processed (url, media_id, timestamp) VALUES (?, ?, ?)",
+                    (url, media_info['id'], int(time.time())))
+        except Exception as e:
+            print(f"⚠️ Error recording processed link: {e}")
     
     def update_media_json(self, link_info, downloaded_files):
         """Update links.json with new download information"""
         try:
-            # Load existing media data
             media_data = []
-            if self.media_file.exists():
-                with open(self.media_file, 'r', encoding='utf-8') as f:
-                    media_data = json.load(f)
             
             # Add new entries for each downloaded file
             for file_path in downloaded_files:
                 file_path = Path(file_path)
                 if file_path.exists():
                     # Generate a unique ID for this media entry
-                    media_id = f"auto_{int(time.time())}_{file_path.stem}_{len(media_data)}"
+                    media_id = f"auto_{int(time.time())}_{file_path.stem}_{len(self.processed_links) + len(media_data)}"
                     
                     # Get file info
                     file_size = file_path.stat().st_size
                     file_extension = file_path.suffix.lower()
                     
                     # Determine media type
-                    video_extensions = {'.mp4', '.avi', '.mov', '.mkv', '.wmv', '.flv', '.webm', '.m4v', '.3gp'}
-                    image_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'}
-                    
-                    if file_extension in video_extensions:
-                        media_type = "video"
-                    elif file_extension in image_extensions:
-                        media_type = "image"
-                    else:
-                        media_type = "document"
+                    media_type = _EXTENSION_TO_MEDIA_TYPE.get(file_extension, "document")
                     
                     media_entry = {
                         "id": media_id,
@@ -214,13 +380,16 @@ class LinkDownloadManager:
                     }
                     
                     media_data.append(media_entry)
-                    
-                    # Mark this link as processed
-                    self.mark_link_processed(link_info['url'], media_entry)
             
-            # Save updated links.json
-            with open(self.media_file, 'w', encoding='utf-8') as f:
-                json.dump(media_data, f, indent=2, ensure_ascii=False)
+            # Append to links.json; existing entries are not re-read or rewritten.
+            # Parallel downloads finish concurrently, so writes are serialized
+            if media_data:
+                with self.processing_lock:
+                    append_to_json_array(self.media_file, media_data)
+                
+                # Record the link once, against its first media entry, and only after
+                # links.json has it, so a failed write leaves the link to be retried
+                self.mark_link_processed(link_info['url'], media_data[0])
             
             print(f"📄 Updated {self.media_file} with {len(downloaded_files)} new entries")
             
@@ -236,27 +405,23 @@ class LinkDownloadManager:
             return False
         
         print(f"⬇️ Downloading: {url}")
-        print(f"👤 Author: {link_info['author']}")
-        print(f"📅 Message time: {datetime.fromtimestamp(link_info['timestamp'])}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Author: %s, message time: %s",
+                         link_info['author'], datetime.fromtimestamp(link_info['timestamp']))
         
-        # Create a new downloader instance for this download
-        downloader = SeleniumVideoDownloader(download_dir=str(self.download_dir), headless=True)
-        
-        try:
-            # Get files before download
-            files_before = set(f.name for f in self.download_dir.iterdir() if f.is_file())
-            
+        # Reuse browsers across links; Chrome startup costs seconds
+        with self.browser_pool.acquire() as downloader:
             # Attempt download
             success = downloader.download(url)
             
             if success:
-                # Get files after download
-                files_after = set(f.name for f in self.download_dir.iterdir() if f.is_file())
-                new_files = files_after - files_before
+                # The downloader reports the files it saved, so the download
+                # directory doesn't need to be listed before and after
+                downloaded_files = downloader.downloaded_files
                 
-                if new_files:
-                    downloaded_files = [self.download_dir / filename for filename in new_files]
-                    print(f"✅ Downloaded {len(new_files)} file(s): {list(new_files)}")
+                if downloaded_files:
+                    new_files = [f.name for f in downloaded_files]
+                    print(f"✅ Downloaded {len(new_files)} file(s): {new_files}")
                     
                     # Update links.json
                     self.update_media_json(link_info, downloaded_files)
@@ -269,20 +434,15 @@ class LinkDownloadManager:
             else:
                 print(f"❌ Failed to download: {url}")
                 return False
-                
-        finally:
-            # Always clean up the downloader
-            downloader.cleanup()
     
     def process_new_links(self, force=False):
         """Process all new links found in messages.json"""
-        with self.processing_lock:
-            if self.is_processing and not force:
-                print("⏳ Already processing links, skipping...")
-                return
-            
-            self.is_processing = True
-            
+        # Single flight: a concurrent trigger bails out at once, while a forced
+        # run waits for the current one to finish instead of overlapping it
+        if not self._inflight.acquire(blocking=force):
+            print("⏳ Already processing links, skipping...")
+            return
+        
         try:
             print(f"🔄 Processing links... (Force: {force})")
             
@@ -298,7 +458,12 @@ class LinkDownloadManager:
                 self.update_file_state()
                 return
             
-            new_links = [link for link in links if not self.is_link_processed(link['url'])]
+            # The same URL can appear in several messages; download it once
+            unique_links = {}
+            for link in links:
+                if not self.is_link_processed(link['url']):
+                    unique_links.setdefault(link['url'], link)
+            new_links = list(unique_links.values())
             
             if not new_links:
                 print("ℹ️ No new links to process")
@@ -307,17 +472,17 @@ class LinkDownloadManager:
             
             print(f"🆕 Found {len(new_links)} new links to download")
             
-            for i, link_info in enumerate(new_links, 1):
-                print(f"\n📥 Processing link {i}/{len(new_links)}")
-                print("-" * 50)
-                
-                try:
-                    self.download_link(link_info)
-                    # Small delay between downloads
-                    time.sleep(2)
-                except Exception as e:
-                    print(f"❌ Error processing link {link_info['url']}: {e}")
-                    continue
+            # Downloads are network-bound and independent, so run several at once;
+            # one worker per pooled browser, so no worker waits on another's browser
+            with ThreadPoolExecutor(max_workers=self.browser_pool.max_size) as executor:
+                futures = {executor.submit(self.download_link, link_info): link_info for link_info in new_links}
+                for i, future in enumerate(as_completed(futures), 1):
+                    link_info = futures[future]
+                    try:
+                        future.result()
+                        print(f"📥 Processed link {i}/{len(new_links)}")
+                    except Exception as e:
+                        print(f"❌ Error processing link {link_info['url']}: {e}")
             
             print(f"\n✅ Finished processing {len(new_links)} links")
             
@@ -325,58 +490,244 @@ class LinkDownloadManager:
             self.update_file_state()
             
         finally:
-            self.is_processing = False
+            self._inflight.release()
     
     def cleanup(self):
         """Clean up resources"""
-        if hasattr(self, 'downloader') and self.downloader:
-            self.downloader.cleanup()
+        # Let a running batch finish before its browsers and database go away. The
+        # lock is never released, so a run triggered after this point is skipped
+        if not self._inflight.acquire(blocking=False):
+            print("⏳ Waiting for the current downloads to finish...")
+            self._inflight.acquire()
+        self.browser_pool.close()
+        self.db.close()
+
+
+class DownloadEventHandler(FileSystemEventHandler):
+    """Signal when a finished file appears in the download directory"""
+    PARTIAL_SUFFIXES = ('.crdownload', '.tmp')
+    
+    def __init__(self):
+        self.downloaded_event = threading.Event()
+        self.downloaded_files = []
+    
+    def _record(self, path):
+        name = os.path.basename(path)
+        if name.startswith('.') or name.endswith(self.PARTIAL_SUFFIXES):
+            return
+        self.downloaded_files.append(path)
+        self.downloaded_event.set()
+    
+    def on_created(self, event):
+        # Chrome reserves the final name with an empty placeholder; skip it
+        if not event.is_directory and os.path.exists(event.src_path) and os.path.getsize(event.src_path) > 0:
+            self._record(event.src_path)
+    
+    def on_moved(self, event):
+        # Chrome renames the .crdownload file to its final name once complete
+        if not event.is_directory:
+            self._record(event.dest_path)
+
+
+class SharedChromeService(Service):
+    """chromedriver service started once and shared by every browser that is given it"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._start_lock = threading.Lock()
+    
+    def start(self):
+        # webdriver.Chrome starts its service for every new browser; launch the
+        # process only the first time, or again if it has died
+        with self._start_lock:
+            process = getattr(self, 'process', None)
+            if process is None or process.poll() is not None:
+                super().start()
+    
+    def stop(self):
+        # driver.quit() stops its service; the other browsers still need it
+        pass
+    
+    def shutdown(self):
+        """Stop the chromedriver process once no browser uses it"""
+        if getattr(self, 'process', None) is not None:
+            super().stop()
 
 
 class SeleniumVideoDownloader:
-    def __init__(self, download_dir="media", headless=True):
+    # Static Chrome configuration, shared by every driver instance
+    _BASE_ARGS = (
+        "--no-sandbox",
+        "--disable-dev-shm-usage",
+        "--disable-blink-features=AutomationControlled",
+        "--disable-web-security",
+        "--allow-running-insecure-content",
+        "--disable-features=VizDisplayCompositor",
+        # The download pages are only clicked through, never looked at
+        "--blink-settings=imagesEnabled=false",
+        # User agent to appear more like a real browser
+        f"--user-agent={_HTTP_USER_AGENT}",
+    )
+    _BASE_PREFS = {
+        "download.prompt_for_download": False,
+        "download.directory_upgrade": True,
+        "safebrowsing.enabled": False,
+        "safebrowsing.disable_download_protection": True,
+        "profile.default_content_setting_values.notifications": 2,
+        "profile.default_content_settings.popups": 0,
+        "profile.managed_default_content_settings.images": 2,
+    }
+    # Web fonts have no content setting, so they are blocked by URL instead.
+    # Stylesheets stay on: the button lookups depend on computed visibility
+    _BLOCKED_URLS = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"]
+    # Profile of the long-running Chrome used with debug_port, so its cookies
+    # survive restarts of this script
+    _DEBUG_PROFILE_DIR = Path.home() / ".cache" / "link-dl-chrome"
+    # That Chrome keeps running, with a persistent profile, after this script
+    # exits, so it is never started with its sandbox or same-origin policy off
+    _DEBUG_CHROME_EXCLUDED_ARGS = ("--no-sandbox", "--disable-web-security")
+    _CHROME_BINARIES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+    
+    # Google Drive "download anyway" controls, joined into compound selectors
+    # so each lookup is a single find_elements round trip
+    _VIRUS_WARNING_SELECTOR = ", ".join([
+        "form[action*='confirm'] input[type='submit']",
+        "form[action*='confirm'] button",
+        "a[href*='confirm=']",
+        "a[href*='&confirm=']",
+        "#download-form input[type='submit']",
+        "#download-form button",
+        "input[value*='Download anyway']",
+        "button[value*='Download anyway']",
+        "input[name='confirm']",
+        "form input[type='submit']",
+        "form[method='post'] input[type='submit']",
+        "form[method='post'] button[type='submit']",
+    ])
+    _DRIVE_DOWNLOAD_SELECTOR = ", ".join([
+        "a#uc-download-link",
+        "a[id*='download-link']",
+        "form[id='download-form'] button",
+        "form[id='downloadForm'] button",
+        "input[name='confirm']",
+        "button[aria-label*='Download']",
+        "a[href*='confirm=t']",
+        "a[href*='confirm=no_antivirus']",
+        "form[action*='confirm'] button",
+        "form[method='post'] button[type='submit']",
+        "#download-form input[type='submit']",
+        ".uc-error-subcaption a",
+        "noscript a[href*='confirm']",
+    ])
+    
+    # Serializes moving finished files into the shared download directory
+    _publish_lock = threading.Lock()
+    
+    def __init__(self, download_dir="media", headless=True, service=None, debug_port=None, staging_dir=None):
         self.download_dir = Path(download_dir).resolve()
         self.download_dir.mkdir(exist_ok=True)
+        # Where the browser and the HTTP paths write. Pooled downloaders each get
+        # a private directory, so completion checks only see their own files;
+        # finished files are then moved into download_dir
+        self.staging_dir = Path(staging_dir).resolve() if staging_dir else self.download_dir
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
         self.headless = headless
+        self.service = service
+        self.debug_port = debug_port
         self.driver = None
-        self.video_extensions = {'.mp4', '.avi', '.mov', '.mkv', '.wmv', '.flv', '.webm', '.m4v', '.3gp'}
         
-    def setup_driver(self):
-        """Setup Chrome driver with download preferences"""
+        # Files saved by the current download() call, the subset reported by
+        # Chrome's own download events, the GUIDs of the browser downloads this
+        # call started, and browser downloads not yet finished (across calls)
+        self.downloaded_files = []
+        self._event_files = []
+        self._download_guids = set()
+        self._active_downloads = set()
+    
+    @classmethod
+    def _build_options(cls, download_dir, headless):
+        """Build Chrome options from the static configuration"""
         chrome_options = Options()
+        # Hand control back at DOMContentLoaded instead of waiting for every sub-resource
+        chrome_options.page_load_strategy = 'eager'
+        for argument in cls._BASE_ARGS:
+            chrome_options.add_argument(argument)
+        if headless:
+            chrome_options.add_argument("--headless")
         
         # Set download directory
-        prefs = {
-            "download.default_directory": str(self.download_dir),
-            "download.prompt_for_download": False,
-            "download.directory_upgrade": True,
-            "safebrowsing.enabled": False,
-            "safebrowsing.disable_download_protection": True,
-            "profile.default_content_setting_values.notifications": 2,
-            "profile.default_content_settings.popups": 0,
-            "profile.managed_default_content_settings.images": 2,
-        }
-        chrome_options.add_experimental_option("prefs", prefs)
-        
-        # Additional Chrome options
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_argument("--disable-web-security")
-        chrome_options.add_argument("--allow-running-insecure-content")
-        chrome_options.add_argument("--disable-features=VizDisplayCompositor")
+        chrome_options.add_experimental_option("prefs", {**cls._BASE_PREFS, "download.default_directory": str(download_dir)})
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
         
+        # Surface DevTools page events (including downloads) through the performance log
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        chrome_options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": False, "enablePage": True})
+        return chrome_options
+    
+    def _debug_chrome_running(self):
+        """Whether something is listening on debug_port"""
+        try:
+            socket.create_connection(("127.0.0.1", self.debug_port), timeout=0.2).close()
+            return True
+        except OSError:
+            return False
+    
+    def _launch_debug_chrome(self):
+        """Start a Chrome that outlives this script, listening on debug_port"""
+        binary = next(filter(None, map(shutil.which, self._CHROME_BINARIES)), None)
+        if not binary:
+            print("⚠️ Chrome binary not found; launching a private browser instead")
+            return False
+        
+        command = [binary, f"--remote-debugging-port={self.debug_port}",
+                   f"--user-data-dir={self._DEBUG_PROFILE_DIR}",
+                   *(arg for arg in self._BASE_ARGS if arg not in self._DEBUG_CHROME_EXCLUDED_ARGS)]
         if self.headless:
-            chrome_options.add_argument("--headless")
+            command.append("--headless")
+        # A new session keeps Chrome alive when this process exits
+        subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
         
-        # User agent to appear more like a real browser
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+        deadline = time.time() + 10
+        while time.time() < deadline:
+            if self._debug_chrome_running():
+                print(f"🚀 Started Chrome on debugging port {self.debug_port}")
+                return True
+            time.sleep(0.2)
+        print("⚠️ Chrome did not open its debugging port; launching a private browser instead")
+        return False
+    
+    def _attach_options(self):
+        """Options that attach to the Chrome on debug_port, or None if there is none"""
+        if not self._debug_chrome_running() and not self._launch_debug_chrome():
+            return None
+        
+        # Launch arguments and prefs don't apply to a running browser; downloads
+        # are configured over CDP in setup_driver either way
+        chrome_options = Options()
+        chrome_options.page_load_strategy = 'eager'
+        chrome_options.debugger_address = f"127.0.0.1:{self.debug_port}"
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        chrome_options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": False, "enablePage": True})
+        return chrome_options
+        
+    def setup_driver(self):
+        """Setup Chrome driver with download preferences"""
+        chrome_options = self.debug_port and self._attach_options()
+        if not chrome_options:
+            chrome_options = self._build_options(self.staging_dir, self.headless)
         
         try:
-            self.driver = webdriver.Chrome(options=chrome_options)
+            self.driver = webdriver.Chrome(options=chrome_options, service=self.service)
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            # Allow downloads up front (prefs alone are ignored by headless Chrome)
+            # and have Chrome report each download's filename and progress
+            self.driver.execute_cdp_cmd("Browser.setDownloadBehavior", {
+                "behavior": "allow",
+                "downloadPath": str(self.staging_dir),
+                "eventsEnabled": True,
+            })
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self._BLOCKED_URLS})
             print("✅ Chrome driver initialized successfully")
             return True
             
@@ -385,81 +736,167 @@ class SeleniumVideoDownloader:
             print("💡 Make sure you have Chrome and chromedriver installed")
             return False
     
+    def _record_download(self, path):
+        """Remember a file saved by the current download"""
+        path = Path(path)
+        if path.is_file() and path not in self.downloaded_files:
+            self.downloaded_files.append(path)
+    
+    def _drain_download_events(self):
+        """Read Chrome's download events from the performance log, recording finished files"""
+        states = []
+        try:
+            entries = self.driver.get_log('performance')
+        except Exception:
+            return states
+        
+        for entry in entries:
+            message = json.loads(entry['message'])['message']
+            method = message.get('method', '')
+            params = message.get('params', {})
+            
+            # Chrome emits both Page.* and Browser.* variants depending on version
+            if method.endswith('.downloadWillBegin'):
+                self._download_guids.add(params['guid'])
+                self._active_downloads.add(params['guid'])
+            elif method.endswith('.downloadProgress'):
+                if params.get('state') in ('completed', 'canceled'):
+                    self._active_downloads.discard(params['guid'])
+                # Downloads that began before this download() call belong to an
+                # earlier link, however late they finish
+                if params['guid'] not in self._download_guids:
+                    continue
+                states.append(params.get('state'))
+                # Only Browser.* events carry the saved path. The suggested name is
+                # not used: Chrome saves "name (1).ext" when the name is taken, so it
+                # could point at an older file; callers look in the directory instead
+                if params.get('state') == 'completed' and params.get('filePath'):
+                    path = self.staging_dir / Path(params['filePath']).name
+                    if path not in self._event_files:
+                        self._event_files.append(path)
+        return states
+    
+    def _snapshot_download_dir(self):
+        """Map each file in the staging directory to its current size"""
+        snapshot = {}
+        try:
+            with os.scandir(self.staging_dir) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        snapshot[entry.name] = entry.stat().st_size
+        except Exception as e:
+            print(f"⚠️ Error reading initial files: {e}")
+        return snapshot
+    
+    def _new_finished_files(self, initial_files):
+        """Finished files in the staging directory that were not in initial_files"""
+        with os.scandir(self.staging_dir) as entries:
+            return [Path(entry.path) for entry in entries
+                    if entry.is_file() and entry.name not in initial_files and not entry.name.startswith('.')
+                    and not entry.name.endswith(DownloadEventHandler.PARTIAL_SUFFIXES)]
+    
     # Also update the wait_for_download_completion method to better handle Google Drive downloads
-    def wait_for_download_completion(self, timeout=300):
+    def wait_for_download_completion(self, timeout=300, initial_files=None):
         """Wait for download to complete - Enhanced for Google Drive"""
         print("⏳ Waiting for download to complete...")
         start_time = time.time()
         
-        # Get initial state
-        initial_files = set()
-        initial_sizes = {}
-        
-        try:
-            for f in self.download_dir.iterdir():
-                if f.is_file():
-                    initial_files.add(f.name)
-                    initial_sizes[f.name] = f.stat().st_size
-        except Exception as e:
-            print(f"⚠️ Error reading initial files: {e}")
+        # Get initial state; callers that wait repeatedly pass one shared
+        # _snapshot_download_dir() taken before the download was triggered
+        initial_sizes = dict(initial_files) if initial_files is not None else self._snapshot_download_dir()
+        initial_files = set(initial_sizes)
         
         print(f"📊 Initial files in directory: {len(initial_files)}")
         
-        # Check Chrome's download status through JavaScript
-        check_interval = 1  # Check every second
+        # Wake the polling loop as soon as a finished file lands in the
+        # directory (inotify on Linux) instead of only on its next tick
+        handler = DownloadEventHandler()
+        observer = Observer()
+        observer.schedule(handler, path=str(self.staging_dir), recursive=False)
+        observer.start()
+        try:
+            return self._poll_for_download(start_time, timeout, initial_files, initial_sizes, handler.downloaded_event)
+        finally:
+            observer.stop()
+            observer.join()
+    
+    def _poll_for_download(self, start_time, timeout, initial_files, initial_sizes, wake):
+        """Polling loop behind wait_for_download_completion; wake interrupts each pause"""
+        def pause(seconds):
+            if wake.wait(seconds):
+                wake.clear()
+        
+        check_interval = 1  # Filesystem events cut the wait short
         last_check_time = start_time
         download_detected = False
+        events_seen = False
+        completed_seen = False
         
         while time.time() - start_time < timeout:
             try:
                 current_time = time.time()
                 
-                # Check Chrome downloads using JavaScript
-                try:
-                    # This JavaScript checks if there are any active downloads
-                    downloads_active = self.driver.execute_script("""
-                        var items = document.querySelector('downloads-manager');
-                        if (items && items.shadowRoot) {
-                            var downloads = items.shadowRoot.querySelectorAll('downloads-item');
-                            return downloads.length > 0;
-                        }
-                        return false;
-                    """)
-                    
-                    if downloads_active:
-                        download_detected = True
-                        print("📥 Active download detected in Chrome")
-                except:
-                    # If we can't check Chrome downloads, continue with file system check
-                    pass
+                # Chrome reports its own downloads through the performance log;
+                # reading it needs no DOM query in the page
+                states = self._drain_download_events()
+                if states:
+                    download_detected = events_seen = True
+                if 'completed' in states:
+                    completed_seen = True
+                if completed_seen:
+                    # Page.* events don't say where the file went; take what appeared
+                    # in the directory since the snapshot
+                    finished = self._event_files or self._new_finished_files(initial_files)
+                    if finished:
+                        print(f"✅ Download completed!")
+                        for path in finished:
+                            print(f"📁 Downloaded: {path.name}")
+                            self._record_download(path)
+                        return True
+                
+                # Once Chrome reports progress, its events alone decide completion;
+                # the directory may also hold other browsers' partial downloads.
+                # The filesystem watcher wakes the pause when the file is renamed
+                if events_seen:
+                    if current_time - last_check_time > 5:
+                        print(f"⏱️ Still downloading... ({int(current_time - start_time)}s elapsed)")
+                        last_check_time = current_time
+                    pause(check_interval)
+                    continue
+                
+                # Without events (older Chrome), fall back to scanning the directory
+                # One directory pass classifies partial downloads and finished files
+                crdownload_files = []
+                tmp_files = []
+                current_sizes = {}
+                with os.scandir(self.staging_dir) as entries:
+                    for entry in entries:
+                        if not entry.is_file():
+                            continue
+                        if entry.name.endswith('.crdownload'):
+                            crdownload_files.append(entry)
+                        elif entry.name.endswith('.tmp'):
+                            tmp_files.append(entry)
+                        elif not entry.name.startswith('.'):
+                            current_sizes[entry.name] = entry.stat().st_size
+                current_files = set(current_sizes)
                 
                 # Check for .crdownload files (Chrome partial downloads)
-                crdownload_files = list(self.download_dir.glob("*.crdownload"))
                 if crdownload_files:
                     download_detected = True
                     file_size = crdownload_files[0].stat().st_size
                     file_size_mb = file_size / (1024 * 1024)
-                    print(f"📥 Download in progress: {crdownload_files[0].name} ({file_size_mb:.1f} MB)")
-                    time.sleep(2)
+                    logger.debug("Download in progress: %s (%.1f MB)", crdownload_files[0].name, file_size_mb)
+                    pause(2)
                     continue
                 
                 # Check for .tmp files
-                tmp_files = list(self.download_dir.glob("*.tmp"))
                 if tmp_files:
                     download_detected = True
-                    print(f"📥 Temporary file detected: {tmp_files[0].name}")
-                    time.sleep(1)
+                    logger.debug("Temporary file detected: %s", tmp_files[0].name)
+                    pause(1)
                     continue
                 
-                # Get current file state
-                current_files = set()
-                current_sizes = {}
-                
-                for f in self.download_dir.iterdir():
-                    if f.is_file() and not f.name.startswith('.'):
-                        current_files.add(f.name)
-                        current_sizes[f.name] = f.stat().st_size
-                
                 # Check for new files
                 new_files = current_files - initial_files
                 
@@ -469,6 +906,7 @@ class SeleniumVideoDownloader:
                         file_size = current_sizes.get(filename, 0)
                         file_size_mb = file_size / (1024 * 1024)
                         print(f"📁 Downloaded: {filename} ({file_size_mb:.1f} MB)")
+                        self._record_download(self.staging_dir / filename)
                     return True
                 
                 # Check for files that have grown
@@ -478,7 +916,7 @@ class SeleniumVideoDownloader:
                     if new_size > old_size:
                         download_detected = True
                         growth_mb = (new_size - old_size) / (1024 * 1024)
-                        print(f"📈 File growing: {filename} (+{growth_mb:.1f} MB)")
+                        logger.debug("File growing: %s (+%.1f MB)", filename, growth_mb)
                         initial_sizes[filename] = new_size  # Update size for next check
                 
                 # If we haven't detected any download activity after 10 seconds, likely failed
@@ -499,7 +937,7 @@ class SeleniumVideoDownloader:
                                 print(f"🔘 Found {len(download_elements)} download elements, clicking first one...")
                                 download_elements[0].click()
                                 download_detected = True  # Give it more time
-                                time.sleep(3)
+                                pause(3)
                     except:
                         pass
                     
@@ -512,7 +950,7 @@ class SeleniumVideoDownloader:
                     print(f"⏱️ Still waiting... ({elapsed}s elapsed, {len(current_files)} files in directory)")
                     last_check_time = current_time
                 
-                time.sleep(check_interval)
+                pause(check_interval)
                 
             except Exception as e:
                 print(f"⚠️ Error during download check: {e}")
@@ -520,55 +958,34 @@ class SeleniumVideoDownloader:
         
         # Final check
         print("⚠️ Download timeout reached")
-        final_files = set(f.name for f in self.download_dir.iterdir() if f.is_file())
-        final_new_files = final_files - initial_files
-        
-        if final_new_files:
-            print(f"✅ Found files after timeout: {list(final_new_files)}")
-            return True
+        with os.scandir(self.staging_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name not in initial_files and not entry.name.endswith('.crdownload'):
+                    print(f"✅ Found file after timeout: {entry.name}")
+                    self._record_download(entry.path)
+                    return True
         
         return False
 
+    def _wait_for_page(self, timeout=10):
+        """Wait until the current page has fully loaded instead of sleeping a fixed time"""
+        # The eager load strategy makes get() return at DOMContentLoaded, when a
+        # body always exists, so wait for the load event itself
+        try:
+            WebDriverWait(self.driver, timeout).until(
+                lambda driver: driver.execute_script("return document.readyState") == "complete")
+        except TimeoutException:
+            print("⚠️ Page did not finish loading in time")
+    
     def handle_google_drive_virus_warning(self):
         """Handle Google Drive virus scan warning page"""
         print("🦠 Handling virus scan warning...")
-        time.sleep(3)
-        
-        download_anyway_selectors = [
-            "form[action*='confirm'] input[type='submit']",
-            "form[action*='confirm'] button",
-            "a[href*='confirm=']",
-            "a[href*='&confirm=']",
-            "#download-form input[type='submit']",
-            "#download-form button",
-            "input[value*='Download anyway']",
-            "button[value*='Download anyway']",
-            "input[name='confirm']",
-            "form input[type='submit']",
-            "form[method='post'] input[type='submit']",
-            "form[method='post'] button[type='submit']",
-        ]
-        
-        for selector in download_anyway_selectors:
-            try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                for element in elements:
-                    if element.is_displayed():
-                        try:
-                            self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                            time.sleep(1)
-                            element.click()
-                            print("✅ Successfully clicked download element")
-                            return True
-                        except Exception:
-                            try:
-                                self.driver.execute_script("arguments[0].click();", element)
-                                print("✅ JavaScript click successful")
-                                return True
-                            except Exception:
-                                continue
-            except Exception:
-                continue
+        try:
+            if self._click_first_visible(self._VIRUS_WARNING_SELECTOR, timeout=10):
+                print("✅ Successfully clicked download element")
+                return True
+        except Exception:
+            pass
         
         print("❌ Could not handle virus warning page")
         return False
@@ -582,20 +999,14 @@ class SeleniumVideoDownloader:
                 if not self.setup_driver():
                     return False
             
+            # Snapshot once so every completion check below diffs against the same state
+            initial_files = self._snapshot_download_dir()
+            
             print(f"🔗 Opening Google Drive URL: {url}")
             self.driver.get(url)
-            time.sleep(5)
             
-            # Extract file ID from various URL formats
-            file_id = None
-            current_url = self.driver.current_url
-            
-            if '/file/d/' in url:
-                file_id = url.split('/file/d/')[1].split('/')[0]
-            elif '/file/d/' in current_url:
-                file_id = current_url.split('/file/d/')[1].split('/')[0]
-            elif 'id=' in current_url:
-                file_id = current_url.split('id=')[1].split('&')[0]
+            # Extract file ID from the link, or from where Drive redirected to
+            file_id = _drive_file_id(url) or _drive_file_id(self.driver.current_url)
             
             if not file_id:
                 print("❌ Could not extract file ID from URL")
@@ -607,72 +1018,52 @@ class SeleniumVideoDownloader:
             direct_url = f"https://drive.google.com/uc?export=download&id={file_id}"
             print(f"🔗 Trying direct download URL...")
             self.driver.get(direct_url)
-            time.sleep(5)
+            self._wait_for_page()
             
             # Check if we got a virus warning page
-            page_source = self.driver.page_source.lower()
-            if 'virus scan warning' in page_source or 'can\'t scan this file for viruses' in page_source:
+            is_warning, confirm_code = self.driver.execute_script(_DRIVE_WARNING_JS, _CONFIRM_RE.pattern)
+            if is_warning:
                 print("⚠️ Virus scan warning detected")
                 
                 # Enhanced virus warning handling
                 handled = False
                 
                 # Method 1: Look for the download anyway button/link
-                download_selectors = [
-                    # Common selectors for the download anyway button
-                    "a#uc-download-link",
-                    "a[id*='download-link']",
-                    "form[id='download-form'] button",
-                    "form[id='downloadForm'] button",
-                    "input[name='confirm']",
-                    "button[aria-label*='Download']",
-                    "a[href*='confirm=t']",
-                    "a[href*='confirm=no_antivirus']",
-                    "form[action*='confirm'] button",
-                    "form[method='post'] button[type='submit']",
-                    "#download-form input[type='submit']",
-                    ".uc-error-subcaption a",
-                    "noscript a[href*='confirm']"
-                ]
-                
-                for selector in download_selectors:
-                    try:
-                        elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                        for element in elements:
-                            if element.is_displayed():
-                                href = element.get_attribute('href')
-                                if href and 'confirm=' in href:
-                                    # If it's a link with confirm parameter, navigate to it
-                                    print(f"📎 Found download link: {href[:50]}...")
-                                    self.driver.get(href)
+                try:
+                    elements = self.driver.find_elements(By.CSS_SELECTOR, self._DRIVE_DOWNLOAD_SELECTOR)
+                    
+                    # Fetch visibility and href for every candidate in one round trip
+                    metas = self.driver.execute_script(
+                        "return arguments[0].map(e => [e.offsetParent !== null, e.href || '']);", elements)
+                    for element, (visible, href) in zip(elements, metas):
+                        if visible:
+                            if href and 'confirm=' in href:
+                                # If it's a link with confirm parameter, navigate to it
+                                print(f"📎 Found download link: {href[:50]}...")
+                                self.driver.get(href)
+                                handled = True
+                                break
+                            else:
+                                # If it's a button, click it
+                                try:
+                                    element.click()
                                     handled = True
+                                    print("✅ Clicked download button")
                                     break
-                                else:
-                                    # If it's a button, click it
-                                    try:
-                                        element.click()
-                                        handled = True
-                                        print("✅ Clicked download button")
-                                        break
-                                    except:
-                                        self.driver.execute_script("arguments[0].click();", element)
-                                        handled = True
-                                        print("✅ JavaScript clicked download button")
-                                        break
-                        if handled:
-                            break
-                    except Exception as e:
-                        continue
+                                except:
+                                    self.driver.execute_script("arguments[0].click();", element)
+                                    handled = True
+                                    print("✅ JavaScript clicked download button")
+                                    break
+                except Exception:
+                    pass
                 
                 # Method 2: Extract confirm parameter and build URL manually
                 if not handled:
                     print("🔍 Extracting confirm parameter from page...")
                     try:
-                        # Look for confirm parameter in the page
-                        import re
-                        confirm_match = re.search(r'confirm=([a-zA-Z0-9_-]+)', page_source)
-                        if confirm_match:
-                            confirm_code = confirm_match.group(1)
+                        # Confirm parameter found in the page by _DRIVE_WARNING_JS
+                        if confirm_code:
                             confirm_url = f"https://drive.google.com/uc?export=download&confirm={confirm_code}&id={file_id}"
                             print(f"🔗 Found confirm code, navigating to: {confirm_url[:70]}...")
                             self.driver.get(confirm_url)
@@ -688,10 +1079,9 @@ class SeleniumVideoDownloader:
                 
                 if handled:
                     print("✅ Virus warning bypassed, download should start")
-                    time.sleep(3)
                     
-                    # Check if download started
-                    if self.wait_for_download_completion(timeout=30):
+                    # Check if download started; the wait itself polls for it
+                    if self.wait_for_download_completion(timeout=30, initial_files=initial_files):
                         return True
                     else:
                         print("⚠️ Download didn't start after handling virus warning")
@@ -702,70 +1092,66 @@ class SeleniumVideoDownloader:
             print("🔍 Checking for automatic download...")
             
             # Sometimes the download starts automatically
-            if self.wait_for_download_completion(timeout=30):
+            if self.wait_for_download_completion(timeout=30, initial_files=initial_files):
                 return True
             
             # Method 3: Try alternative download method using Google Drive API-like URL
             print("🔄 Trying alternative download method...")
             alt_url = f"https://drive.google.com/u/0/uc?export=download&id={file_id}"
             self.driver.get(alt_url)
-            time.sleep(5)
             
             # Final attempt to wait for download
-            return self.wait_for_download_completion(timeout=30)
+            return self.wait_for_download_completion(timeout=30, initial_files=initial_files)
             
-        except Exception as e:
-            print(f"❌ Error downloading with Selenium: {str(e)}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error downloading with Selenium")
+            return False
+        
+    def _find_first_visible(self, selector, text_selector=None, text=None, exact=False):
+        """First displayed and enabled element matching a CSS selector or a button caption, or None"""
+        # Locating and filtering run in the browser, one round trip per attempt
+        return self.driver.execute_script(_FIRST_VISIBLE_JS, selector, text_selector, text, exact)
+    
+    def _click_first_visible(self, selector, text_selector=None, text=None, exact=False, timeout=0):
+        """Click the first displayed and enabled element matching a locator, waiting up to timeout for one"""
+        def find(driver):
+            return self._find_first_visible(selector, text_selector, text, exact)
+        
+        try:
+            element = WebDriverWait(self.driver, timeout).until(find) if timeout else find(self.driver)
+        except TimeoutException:
+            return False
+        if element is None:
             return False
         
+        try:
+            element.click()
+        except (ElementClickInterceptedException, ElementNotInteractableException):
+            # Overlays can swallow native clicks; fall back to a JavaScript click
+            self.driver.execute_script("arguments[0].click();", element)
+        return True
+    
     def handle_wetransfer_flow(self):
         """Handle the complete WeTransfer download flow"""
         try:
             # Accept cookies if present
-            cookie_selectors = [
-                "button[data-testid*='accept']",
-                "button[data-testid*='cookie']",
-                "[data-qa*='cookie'] button",
-                ".cookie-consent button",
-                "button[aria-label*='Accept']"
-            ]
-            
-            for selector in cookie_selectors:
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for element in elements:
-                        if element.is_displayed() and element.is_enabled():
-                            self.driver.execute_script("arguments[0].click();", element)
-                            time.sleep(2)
-                            break
-                except:
-                    continue
+            try:
+                if self._click_first_visible(_COOKIE_SELECTOR):
+                    WebDriverWait(self.driver, 2).until(
+                        EC.invisibility_of_element_located((By.CSS_SELECTOR, _COOKIE_SELECTOR)))
+            except:
+                pass
             
-            # Look for and click "Agree" button
-            time.sleep(3)
-            agree_xpath = "//button[contains(translate(text(), 'AGREE', 'agree'), 'agree')]"
+            # Look for and click "Agree" button, giving it a moment to render
             try:
-                agree_elements = self.driver.find_elements(By.XPATH, agree_xpath)
-                for element in agree_elements:
-                    if element.is_displayed() and element.is_enabled():
-                        self.driver.execute_script("arguments[0].click();", element)
-                        time.sleep(3)
-                        break
+                self._click_first_visible(_AGREE_SELECTOR, "button", "agree", timeout=3)
             except:
                 pass
             
             # Look for download button
-            time.sleep(3)
-            exact_download_xpath = "//button[normalize-space(translate(text(), 'DOWNLOAD', 'download'))='download'] | //a[normalize-space(translate(text(), 'DOWNLOAD', 'download'))='download']"
-            
             try:
-                exact_elements = self.driver.find_elements(By.XPATH, exact_download_xpath)
-                for element in exact_elements:
-                    if element.is_displayed() and element.is_enabled():
-                        self.driver.execute_script("arguments[0].click();", element)
-                        return True
+                if self._click_first_visible(_DOWNLOAD_SELECTOR, "button, a", "download", exact=True, timeout=3):
+                    return True
             except:
                 pass
             
@@ -775,6 +1161,113 @@ class SeleniumVideoDownloader:
             print(f"⚠️ Error in WeTransfer flow: {e}")
             return False
     
+    def resolve_wetransfer_direct_link(self, url):
+        """Resolve a WeTransfer share URL to a signed direct link via the JSON API"""
+        headers = {"User-Agent": _HTTP_USER_AGENT}
+        
+        # Short we.tl links redirect to the full /downloads/... URL
+        if 'we.tl' in url:
+            request = urllib.request.Request(url, headers=headers, method="HEAD")
+            with urllib.request.urlopen(request, timeout=15) as response:
+                url = response.geturl()
+        
+        match = _WETRANSFER_PATH_RE.search(urllib.parse.urlparse(url).path)
+        if not match:
+            print("⚠️ Could not parse transfer ID from WeTransfer URL")
+            return None
+        
+        transfer_id, recipient_id, security_hash = match.groups()
+        payload = {"intent": "entire_transfer", "security_hash": security_hash}
+        if recipient_id:
+            payload["recipient_id"] = recipient_id
+        
+        request = urllib.request.Request(
+            _WETRANSFER_API_URL.format(transfer_id=transfer_id),
+            data=json.dumps(payload).encode(),
+            headers={**headers, "Content-Type": "application/json", "X-Requested-With": "XMLHttpRequest"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=15) as response:
+            return json.load(response).get("direct_link")
+    
+    def _save_response(self, response, default_name):
+        """Stream an open HTTP response into the download directory"""
+        filename = response.headers.get_filename() or Path(urllib.parse.unquote(urllib.parse.urlparse(response.geturl()).path)).name
+        filename = Path(filename or default_name).name
+        target = _free_path(self.staging_dir, filename)
+        
+        # Write to a partial file first so directory watchers ignore it until complete
+        partial = target.with_name(target.name + ".crdownload")
+        try:
+            with open(partial, 'wb') as f:
+                shutil.copyfileobj(response, f, 1 << 16)
+            partial.rename(target)
+        except BaseException:
+            # Don't leave a partial behind for directory waits to spin on
+            partial.unlink(missing_ok=True)
+            raise
+        
+        self._record_download(target)
+        file_size_mb = target.stat().st_size / (1024 * 1024)
+        print(f"📁 Downloaded: {target.name} ({file_size_mb:.1f} MB)")
+        return True
+    
+    def download_direct_link(self, direct_link):
+        """Stream a direct download link into the download directory"""
+        request = urllib.request.Request(direct_link, headers={"User-Agent": _HTTP_USER_AGENT})
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return self._save_response(response, "wetransfer_download")
+    
+    def download_google_drive_http(self, url):
+        """Download from Google Drive over plain HTTP, confirming the virus-scan warning if shown"""
+        try:
+            file_id = _drive_file_id(url)
+            if not file_id:
+                print("⚠️ Could not extract file ID from URL")
+                return False
+            
+            print(f"🔗 Downloading Google Drive file {file_id} over HTTP...")
+            # The warning page sets cookies that the confirmed request must carry
+            opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+            opener.addheaders = [("User-Agent", _HTTP_USER_AGENT)]
+            
+            download_url = f"https://drive.google.com/uc?export=download&id={file_id}"
+            for _ in range(2):
+                with opener.open(download_url, timeout=30) as response:
+                    if response.headers.get_content_type() != "text/html":
+                        return self._save_response(response, f"drive_{file_id}")
+                    page = response.read().decode("utf-8", "replace")
+                
+                # An HTML page means a virus-scan warning (or an error page)
+                download_url = _drive_confirm_url(page, file_id)
+                if not download_url:
+                    break
+            
+            print("⚠️ Google Drive returned a page instead of the file")
+            return False
+        except urllib.error.HTTPError as e:
+            print(f"⚠️ Google Drive request failed with HTTP {e.code}")
+            return False
+        except Exception as e:
+            print(f"⚠️ Google Drive HTTP download failed: {e}")
+            return False
+    
+    def download_wetransfer_api(self, url):
+        """Download from WeTransfer through its JSON API, without a browser"""
+        try:
+            print(f"🔗 Resolving WeTransfer link via API: {url}")
+            direct_link = self.resolve_wetransfer_direct_link(url)
+            if not direct_link:
+                print("⚠️ WeTransfer API returned no direct link")
+                return False
+            return self.download_direct_link(direct_link)
+        except urllib.error.HTTPError as e:
+            print(f"⚠️ WeTransfer API request failed with HTTP {e.code}")
+            return False
+        except Exception as e:
+            print(f"⚠️ WeTransfer API download failed: {e}")
+            return False
+    
     def download_wetransfer_selenium(self, url):
         """Download from WeTransfer using Selenium"""
         try:
@@ -784,28 +1277,104 @@ class SeleniumVideoDownloader:
             
             print(f"🔗 Opening WeTransfer URL: {url}")
             self.driver.get(url)
-            time.sleep(5)
             
-            # Handle the WeTransfer flow
-            if self.handle_wetransfer_flow():
-                print("✅ WeTransfer flow completed, checking for download...")
-                time.sleep(2)
-                return self.wait_for_download_completion(timeout=120)
-            else:
-                print("❌ Failed to complete WeTransfer flow")
-                return False
+            # Proceed as soon as the transfer page renders its download button
+            try:
+                WebDriverWait(self.driver, 15).until(
+                    lambda driver: self._find_first_visible(_DOWNLOAD_SELECTOR, "button", "download"))
+            except TimeoutException:
+                print("⚠️ Download button not found after 15 seconds, trying the flow anyway...")
+            
+            # Watch the download directory before triggering the download so
+            # completion is pushed to us instead of found by rescanning it
+            handler = DownloadEventHandler()
+            observer = Observer()
+            observer.schedule(handler, path=str(self.staging_dir), recursive=False)
+            observer.start()
+            
+            try:
+                # Handle the WeTransfer flow
+                if self.handle_wetransfer_flow():
+                    print("✅ WeTransfer flow completed, waiting for download...")
+                    if handler.downloaded_event.wait(timeout=120):
+                        print(f"✅ Download completed: {Path(handler.downloaded_files[0]).name}")
+                        for path in handler.downloaded_files:
+                            self._record_download(path)
+                        return True
+                    print("⚠️ Download timeout reached")
+                    return False
+                else:
+                    print("❌ Failed to complete WeTransfer flow")
+                    return False
+            finally:
+                observer.stop()
+                observer.join()
                 
         except Exception as e:
             print(f"❌ Error downloading WeTransfer with Selenium: {str(e)}")
             return False
 
+    def download_google_drive(self, url):
+        """Download from Google Drive, preferring plain HTTP over the browser"""
+        if self.download_google_drive_http(url):
+            return True
+        print("🔄 Falling back to browser download...")
+        return self.download_google_drive_selenium(url)
+    
+    def download_wetransfer(self, url):
+        """Download from WeTransfer, preferring the JSON API over the browser"""
+        if self.download_wetransfer_api(url):
+            return True
+        print("🔄 Falling back to browser download...")
+        return self.download_wetransfer_selenium(url)
+    
+    def _clear_staging(self):
+        """Remove files left in a private staging directory by an earlier failed download"""
+        if self.staging_dir == self.download_dir:
+            return
+        with os.scandir(self.staging_dir) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    os.unlink(entry.path)
+    
+    def _publish(self, path):
+        """Move a finished file from the staging directory into download_dir under a free name"""
+        if self.staging_dir == self.download_dir:
+            return path
+        with self._publish_lock:
+            target = _free_path(self.download_dir, path.name)
+            shutil.move(str(path), str(target))
+        return target
+    
     def download(self, url):
         """Main download function"""
+        self.downloaded_files = []
+        self._event_files = []
         try:
-            if 'drive.google.com' in url:
-                return self.download_google_drive_selenium(url)
-            elif 'wetransfer.com' in url or 'we.tl' in url:
-                return self.download_wetransfer_selenium(url)
+            # Consume events still queued from earlier links, then scope to this one
+            if self.driver:
+                self._drain_download_events()
+            self._download_guids = set()
+            self._event_files = []
+            
+            # Start from an empty staging directory so only this link's files appear in it
+            self._clear_staging()
+            
+            host = urllib.parse.urlsplit(url).hostname or ""
+            handler = _HANDLERS.get(host) or _HANDLERS.get(host.split(".", 1)[-1])
+            if handler:
+                success = getattr(self, handler)(url)
+                if self.driver:
+                    self._drain_download_events()
+                # Chrome's download events name exactly this browser's files, but
+                # only trust them when this call started a browser download; an
+                # HTTP or API download never does, and its saved file must stand
+                if self._download_guids and self._event_files:
+                    self.downloaded_files = [path for path in self._event_files if path.is_file()]
+                # Move finished files out of staging into the shared download directory
+                if success:
+                    self.downloaded_files = [self._publish(path) for path in self.downloaded_files]
+                return success
             else:
                 print("❌ Unsupported URL. Only Google Drive and WeTransfer links are supported.")
                 return False
@@ -813,43 +1382,149 @@ class SeleniumVideoDownloader:
             print(f"❌ Error in download: {e}")
             return False
         
+    def reset(self):
+        """Clear browser state between downloads while keeping the browser open"""
+        if not self.driver:
+            return
+        try:
+            # Cancel downloads still running for this link, so they can't finish
+            # later and be mistaken for the next link's file
+            self._drain_download_events()
+            for guid in self._active_downloads:
+                self.driver.execute_cdp_cmd("Browser.cancelDownload", {"guid": guid})
+            self._active_downloads.clear()
+            
+            # A long-running Chrome keeps its cookies so consent banners stay dismissed
+            if not self.debug_port:
+                self.driver.delete_all_cookies()
+            self.driver.get("about:blank")
+        except Exception as e:
+            # The browser is unusable; close it so the next download starts a new one
+            print(f"⚠️ Browser reset failed, restarting on next download: {e}")
+            self.cleanup()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.cleanup()
+        
     def cleanup(self):
         """Clean up and close browser"""
         if self.driver:
             try:
+                # For a browser attached over debug_port, chromedriver ends the
+                # session without closing Chrome, so it stays up for the next run
                 self.driver.quit()
                 print("🧹 Browser closed")
             except:
                 pass
+            self.driver = None
+
+
+class BrowserPool:
+    """Bounded pool of downloaders, each owning one Chrome instance that is reused across links"""
+    def __init__(self, download_dir="media", max_size=2, debug_port=None):
+        self.download_dir = download_dir
+        # Each browser downloads into its own subdirectory of this one
+        self.staging_root = Path(download_dir) / ".staging"
+        self.max_size = max_size
+        self.debug_port = debug_port
+        self.idle = queue.Queue()
+        self.downloaders = []
+        self.lock = threading.Lock()
+        # One chromedriver process serves every browser in the pool
+        self.service = SharedChromeService()
+    
+    @contextmanager
+    def acquire(self):
+        """Borrow a downloader for one link, returning it to the pool afterwards"""
+        downloader = self._checkout()
+        try:
+            yield downloader
+        finally:
+            self._release(downloader)
+    
+    def _checkout(self):
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+        
+        # Browsers are launched lazily, up to max_size; past that, wait for one
+        with self.lock:
+            if len(self.downloaders) < self.max_size:
+                downloader = SeleniumVideoDownloader(
+                    download_dir=self.download_dir, headless=True, service=self.service, debug_port=self.debug_port,
+                    staging_dir=self.staging_root / f"browser-{len(self.downloaders)}")
+                self.downloaders.append(downloader)
+                return downloader
+        return self.idle.get()
+    
+    def _release(self, downloader):
+        # reset() doubles as the health check: a crashed browser fails it and is
+        # closed, and the downloader launches a fresh one on its next use
+        downloader.reset()
+        self.idle.put(downloader)
+    
+    def close(self):
+        """Quit every browser in the pool, then the chromedriver they share"""
+        for downloader in self.downloaders:
+            downloader.cleanup()
+        self.service.shutdown()
 
 
 class MessagesFileHandler(FileSystemEventHandler):
     """Handle file system events for messages.json"""
+    DEBOUNCE_SECONDS = 0.5
+    
     def __init__(self, download_manager):
         self.download_manager = download_manager
-        self.last_event_time = 0
-        
+        self._timer = None
+        self._timer_lock = threading.Lock()
+        self._target_name = download_manager.messages_file.name
+    
     def on_modified(self, event):
-        if event.is_directory:
+        if not event.is_directory:
+            self._handle(event.src_path)
+    
+    def on_created(self, event):
+        if not event.is_directory:
+            self._handle(event.src_path)
+    
+    def on_moved(self, event):
+        # Atomic writers save to a temp file and rename it over messages.json
+        if not event.is_directory:
+            self._handle(event.dest_path)
+    
+    def _handle(self, path):
+        # Check if it's the messages.json file; the name test is a plain string
+        # compare, so unrelated files in the directory never reach resolve()
+        if os.path.basename(path) != self._target_name:
             return
-            
-        # Check if it's the messages.json file
-        event_path = Path(event.src_path).resolve()
+        event_path = Path(path).resolve()
         if event_path != self.download_manager.messages_file:
             return
-            
-        # Debounce events (avoid multiple triggers)
-        current_time = time.time()
-        if current_time - self.last_event_time < 3:  # 3 second cooldown
-            return
-            
-        self.last_event_time = current_time
         
+        # Debounce events: restart the timer on every write so a burst
+        # collapses into one run once the file has settled
+        with self._timer_lock:
+            if self._timer:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.DEBOUNCE_SECONDS, self._process)
+            self._timer.daemon = True
+            self._timer.start()
+    
+    def cancel(self):
+        """Drop a pending debounced run, e.g. on shutdown"""
+        with self._timer_lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+    
+    def _process(self):
         print(f"\n📄 messages.json modified at {datetime.now().strftime('%H:%M:%S')}")
         
-        # Add delay to ensure file is fully written
-        time.sleep(2)
-        
         try:
             self.download_manager.process_new_links()
         except Exception as e:
@@ -863,16 +1538,20 @@ class PollingMonitor:
         self.poll_interval = poll_interval
         self.running = False
         self.thread = None
+        # Set by stop() so the wait between polls ends at once
+        self._stop = threading.Event()
     
     def start(self):
         """Start polling"""
         self.running = True
+        self._stop.clear()
         self.thread = threading.Thread(target=self._poll_loop, daemon=True)
         self.thread.start()
         print(f"🔄 Started polling every {self.poll_interval} seconds")
     
     def stop(self):
         """Stop polling"""
+        self._stop.set()
         self.running = False
         if self.thread:
             self.thread.join()
@@ -882,10 +1561,11 @@ class PollingMonitor:
         while self.running:
             try:
                 self.download_manager.process_new_links()
-                time.sleep(self.poll_interval)
             except Exception as e:
                 print(f"❌ Polling error: {e}")
-                time.sleep(self.poll_interval)
+            
+            if self._stop.wait(self.poll_interval):
+                return
 
 
 def main():
@@ -900,16 +1580,35 @@ def main():
     print("=" * 60)
     
     # Initialize the download manager
-    download_manager = LinkDownloadManager()
+    # CHROME_DEBUG_PORT keeps one Chrome running between runs and re-attaches to it
+    debug_port = os.environ.get("CHROME_DEBUG_PORT")
+    download_manager = LinkDownloadManager(debug_port=int(debug_port) if debug_port else None)
     
     # Process any existing links first
     print("🔍 Processing existing links...")
     download_manager.process_new_links(force=True)
     
-    # Ask user for monitoring method
-    use_polling = input("\nUse polling mode instead of file watching? (y/n, default: n): ").strip().lower()
+    # Monitoring method comes from WATCH_MODE (poll or fs); only ask when
+    # someone is at the terminal, so supervisors and containers never block
+    mode = os.environ.get("WATCH_MODE")
+    if mode is None and sys.stdin.isatty():
+        mode = input("\nUse polling mode instead of file watching? (y/n, default: n): ")
+    use_polling = (mode or "").strip().lower()
+    
+    # Sleep until Ctrl+C (or docker stop) instead of waking every second to check
+    stop = threading.Event()
+    
+    def request_stop(signum, frame):
+        stop.set()
+        # Shutdown waits for the current downloads; a second signal aborts it
+        print("\n⏳ Finishing current downloads; press Ctrl+C again to quit now")
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
     
-    if use_polling in ['y', 'yes', '1', 'true']:
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+    
+    if use_polling in ['poll', 'y', 'yes', '1', 'true']:
         # Use polling mode
         print("\n🔄 Starting polling mode...")
         poll_interval = 10  # Check every 10 seconds
@@ -918,17 +1617,18 @@ def main():
         
         print(f"🟢 Polling every {poll_interval} seconds. Press Ctrl+C to stop.")
         
-        try:
-            while True:
-                time.sleep(1)
-        except KeyboardInterrupt:
-            print("\n🛑 Stopping polling...")
-            monitor.stop()
+        stop.wait()
+        print("\n🛑 Stopping polling...")
+        monitor.stop()
     else:
         # Use file watching mode
         print("\n👀 Starting file watching mode...")
         event_handler = MessagesFileHandler(download_manager)
-        observer = Observer()
+        # inotify events don't cross Docker bind mounts, so poll there instead
+        if Path('/.dockerenv').exists():
+            observer = PollingObserver(timeout=60)
+        else:
+            observer = Observer()
         
         # Watch the directory containing messages.json
         watch_path = download_manager.messages_file.parent
@@ -941,19 +1641,17 @@ def main():
         backup_monitor = PollingMonitor(download_manager, 30)  # Check every 30 seconds as backup
         backup_monitor.start()
         
-        try:
-            while True:
-                time.sleep(1)
-        except KeyboardInterrupt:
-            print("\n🛑 Stopping monitoring...")
-            observer.stop()
-            backup_monitor.stop()
+        stop.wait()
+        print("\n🛑 Stopping monitoring...")
+        observer.stop()
+        backup_monitor.stop()
         
         observer.join()
+        # Runs happen on the handler's debounce timer, which the observer doesn't own
+        event_handler.cancel()
     
     download_manager.cleanup()
     print("👋 Goodbye!")
     
 if __name__ == "__main__":
-    import sys
     main()
\ No newline at end of file
@@ -0,0 +1,98 @@
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from json_array import iter_json_array, append_to_json_array
+
+
+class IterJsonArrayTest(unittest.TestCase):
+    ITEMS = [{"id": 1, "text": "hello, world"}, [1, 2, 3], "plain", 12345, -0.5, True, None, {"nested": {"a": []}}]
+    
+    def parse(self, text, chunk_size=1 << 16):
+        return list(iter_json_array(io.StringIO(text), chunk_size=chunk_size))
+    
+    def test_items_split_across_chunk_boundaries(self):
+        text = json.dumps(self.ITEMS, indent=2)
+        for chunk_size in range(1, 8):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(self.parse(text, chunk_size), self.ITEMS)
+    
+    def test_numbers_cut_at_chunk_boundary(self):
+        self.assertEqual(self.parse("[12345, 678]", chunk_size=3), [12345, 678])
+        self.assertEqual(self.parse("[-0.5, 1e10]", chunk_size=3), [-0.5, 1e10])
+    
+    def test_empty_arrays(self):
+        for text in ("[]", "[ ]\n", "  \n[\n]\n"):
+            with self.subTest(text=text):
+                self.assertEqual(self.parse(text), [])
+                self.assertEqual(self.parse(text, chunk_size=1), [])
+    
+    def test_crlf_line_endings(self):
+        text = json.dumps(self.ITEMS, indent=2).replace("\n", "\r\n") + "\r\n"
+        self.assertEqual(self.parse(text), self.ITEMS)
+        self.assertEqual(self.parse(text, chunk_size=2), self.ITEMS)
+    
+    def test_non_array_input(self):
+        for text in ('{"a": 1}', '"text"', '', '   '):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    self.parse(text)
+    
+    def test_truncated_array(self):
+        for text in ('[1, 2', '[{"a": 1}, {"b"', '['):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    self.parse(text, chunk_size=3)
+
+
+class AppendToJsonArrayTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "links.json"
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def load(self):
+        return json.loads(self.path.read_text(encoding='utf-8'))
+    
+    def test_creates_missing_file(self):
+        append_to_json_array(self.path, [{"id": "a"}])
+        self.assertEqual(self.load(), [{"id": "a"}])
+    
+    def test_empty_file(self):
+        self.path.write_text("")
+        append_to_json_array(self.path, [{"id": "a"}])
+        self.assertEqual(self.load(), [{"id": "a"}])
+    
+    def test_empty_array(self):
+        self.path.write_text("[]\n")
+        append_to_json_array(self.path, [{"id": "a"}, {"id": "b"}])
+        self.assertEqual(self.load(), [{"id": "a"}, {"id": "b"}])
+    
+    def test_matches_full_rewrite(self):
+        existing = [{"id": "a", "tags": ["x", "y"]}]
+        new = [{"id": "b", "name": "vidéo"}, {"id": "c", "size": 1.5}]
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(existing, f, indent=2, ensure_ascii=False)
+        
+        append_to_json_array(self.path, new)
+        expected = json.dumps(existing + new, indent=2, ensure_ascii=False)
+        self.assertEqual(self.path.read_text(encoding='utf-8'), expected)
+    
+    def test_crlf_file(self):
+        self.path.write_bytes(b'[\r\n  {"id": "a"}\r\n]\r\n')
+        append_to_json_array(self.path, [{"id": "b"}])
+        self.assertEqual(self.load(), [{"id": "a"}, {"id": "b"}])
+    
+    def test_non_array_file(self):
+        self.path.write_text('{"id": "a"}')
+        with self.assertRaises(ValueError):
+            append_to_json_array(self.path, [{"id": "b"}])
+        self.assertEqual(self.path.read_text(), '{"id": "a"}')
+
+
+if __name__ == '__main__':
+    unittest.main()
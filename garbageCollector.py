@@ -1,7 +1,10 @@
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import os
 import shutil
 
-# List of directories to delete completely
+# List of directories to delete completely (purge) or empty of files (clean)
 directories_to_delete = [
     Path('backend/.wwebjs_auth'),
     Path('backend/.wwebjs_cache'),
@@ -11,9 +14,57 @@ directories_to_delete = [
     Path('BestImg_Detection/discarded_images'),
 ]
 
-for dir_path in directories_to_delete:
-    if dir_path.exists() and dir_path.is_dir():
+
+def existing_directories(dirs):
+    """Return the directories that exist, reporting the ones that are skipped"""
+    # Stat all candidates concurrently; each check is a round trip on mounted volumes
+    with ThreadPoolExecutor(max_workers=len(dirs) or 1) as executor:
+        is_dir = list(executor.map(Path.is_dir, dirs))
+
+    present = []
+    for dir_path, ok in zip(dirs, is_dir):
+        if ok:
+            present.append(dir_path)
+        else:
+            print(f"⚠️ Skipping (not found or not a directory): {dir_path}")
+    return present
+
+
+def purge(dirs):
+    """Delete each directory tree completely"""
+    present = existing_directories(dirs)
+    for dir_path in present:
         print(f"🗑️ Deleting: {dir_path}")
-        shutil.rmtree(dir_path)
+
+    # Deletion is I/O-bound, so the trees are removed concurrently
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(shutil.rmtree, present))
+
+
+def clean(dirs):
+    """Delete the files directly inside each directory, keeping subdirectories"""
+    files = []
+    for dir_path in existing_directories(dirs):
+        with os.scandir(dir_path) as entries:
+            files.extend(entry.path for entry in entries if entry.is_file(follow_symlinks=False))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(os.unlink, files))
+
+    print(f"🗑️ Deleted {len(files)} files")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Remove generated media, RSS and session data")
+    parser.add_argument("--mode", choices=["purge", "clean"], default="purge",
+                        help="purge deletes the directories; clean deletes only the files inside them")
+    args = parser.parse_args()
+
+    if args.mode == "purge":
+        purge(directories_to_delete)
     else:
-        print(f"⚠️ Skipping (not found or not a directory): {dir_path}")
+        clean(directories_to_delete)
+
+
+if __name__ == "__main__":
+    main()